@@ -0,0 +1,105 @@
+"""
+api/jobs.py — background optimize jobs
+Jobs run on an in-process thread pool; their state is kept as JSON files under
+PORTDR_JOB_DIR so any gunicorn worker can answer a status poll. Like the
+price cache, that dir must be private: results are served as-is.
+"""
+
+from typing import Any, Callable, Dict, Optional
+import os
+import re
+import time
+import uuid
+import tempfile
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from backend.portfolio.cache import ensure_private_dir
+
+logger = logging.getLogger("api.jobs")
+
+_JOB_DIR = os.environ.get(
+    "PORTDR_JOB_DIR", os.path.join(tempfile.gettempdir(), "portdr-jobs")
+)
+_JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# finished job files are deleted after this long (swept on submit)
+_JOB_TTL = int(os.environ.get("PORTDR_JOB_TTL", str(60 * 60)))
+# "running" for longer than this means the worker died with it; the file is
+# rewritten when the job starts, so its mtime is the start time. Queued jobs
+# are never timed out: they may just be waiting behind long-running ones.
+_JOB_STALE = 15 * 60
+
+# threads start lazily on first submit, i.e. after gunicorn has forked
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("PORTDR_JOB_WORKERS", "2")),
+    thread_name_prefix="optimize-job",
+)
+
+def _path_for(job_id: str) -> str:
+    return os.path.join(_JOB_DIR, f"{job_id}.json")
+
+def _write(job_id: str, state: Dict[str, Any]) -> None:
+    if not ensure_private_dir(_JOB_DIR):
+        raise RuntimeError(f"job dir {_JOB_DIR} is not a private directory owned by this user")
+    fd, tmp = tempfile.mkstemp(dir=_JOB_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(orjson.dumps(state, option=orjson.OPT_SERIALIZE_NUMPY))
+    os.replace(tmp, _path_for(job_id))
+
+def _sweep() -> None:
+    """Delete job files older than _JOB_TTL."""
+    cutoff = time.time() - _JOB_TTL
+    try:
+        names = os.listdir(_JOB_DIR)
+    except FileNotFoundError:
+        return
+    for name in names:
+        path = os.path.join(_JOB_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass  # raced with another worker's sweep
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Job state dict, or None for unknown/malformed/expired ids."""
+    if not _JOB_ID_RE.match(job_id) or not ensure_private_dir(_JOB_DIR):
+        return None
+    path = _path_for(job_id)
+    try:
+        age = time.time() - os.path.getmtime(path)
+        with open(path, "rb") as f:
+            state = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    if state.get("status") == "running" and age > _JOB_STALE:
+        state = {
+            "job_id": job_id,
+            "status": "error",
+            "result": {"ok": False, "type": "server_error", "error": "Job did not finish (worker lost)."},
+        }
+    return state
+
+def submit_job(run: Callable[[], Dict[str, Any]], on_error: Callable[[Exception], Dict[str, Any]]) -> str:
+    """
+    Queue `run` and return its job id. `run` returns the response payload;
+    if it raises, `on_error(exc)` builds the error payload instead.
+    States: queued -> running -> done | error.
+    """
+    job_id = uuid.uuid4().hex
+    _write(job_id, {"job_id": job_id, "status": "queued"})  # raises if the dir is unsafe
+    _sweep()
+
+    def work():
+        _write(job_id, {"job_id": job_id, "status": "running"})
+        try:
+            _write(job_id, {"job_id": job_id, "status": "done", "result": run()})
+        except Exception as e:
+            try:
+                _write(job_id, {"job_id": job_id, "status": "error", "result": on_error(e)})
+            except Exception:
+                logger.exception(f"job {job_id}: failed to record error")
+
+    _EXECUTOR.submit(work)
+    return job_id
@@ -1,37 +1,82 @@
-from flask import request, jsonify, current_app
+import orjson
+from flask import Response, request, current_app
 from . import api_bp
-from backend.portfolio.optimizer import optimize_portfolio, InputError
+
+def _json(payload, status: int = 200) -> Response:
+    """orjson response; serializes NumPy arrays/scalars natively (NaN -> null)."""
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype="application/json",
+    )
+
+from backend.portfolio.optimizer import optimize_portfolio, validate_tickers, InputError
+from backend.api.jobs import submit_job, get_job
+
+def _optimize_args(data):
+    return {
+        "tickers": data.get("tickers", []),
+        "risk_free": float(data.get("risk_free", 0.02)),
+        "simulations": int(data.get("simulations", 5000)),
+        "verbose": bool(data.get("verbose", False)),
+        # PNGs stay on by default for existing clients; send false to get raw chart data
+        "render_plots": bool(data.get("render_plots", True)),
+    }
+
+def _run_optimize(args):
+    results, plots = optimize_portfolio(
+        args["tickers"], risk_free=args["risk_free"], simulations=args["simulations"],
+        render_plots=args["render_plots"], verbose=args["verbose"]
+    )
+    return {
+        "ok": True,
+        "results": results,   # risk_return, correlation, optimal_portfolio
+        "plots": plots,       # base64 pngs, or efficient_frontier_data/weights if render_plots=false
+        "meta": {
+            "tickers": args["tickers"],
+            "risk_free": args["risk_free"],
+            "simulations": args["simulations"],
+            "render_plots": args["render_plots"]
+        }
+    }
+
+def _optimize_error(e, logger):
+    if isinstance(e, InputError):
+        return {"ok": False, "type": "input_error", "error": str(e)}, 400
+    logger.exception("optimize_portfolio failed", exc_info=e)
+    return {"ok": False, "type": "server_error", "error": "Internal server error"}, 500
 
 @api_bp.route("/optimize", methods=["POST"])
 def optimize():
     data = request.get_json(silent=True) or {}
-    tickers = data.get("tickers", [])
-    risk_free = float(data.get("risk_free", 0.02))
-    simulations = int(data.get("simulations", 5000))
-    verbose = bool(data.get("verbose", False))
+    args = _optimize_args(data)
 
-    try:
-        results, plots = optimize_portfolio(
-            tickers, risk_free=risk_free, simulations=simulations, verbose=verbose
-        )
-        payload = {
-            "ok": True,
-            "results": results,   # risk_return, correlation, optimal_portfolio
-            "plots": plots,       # base64 png strings: efficient_frontier, pie_chart
-            "meta": {
-                "tickers": tickers,
-                "risk_free": risk_free,
-                "simulations": simulations
-            }
-        }
-        return jsonify(payload), 200
-
-    except InputError as e:
-        return jsonify({"ok": False, "type": "input_error", "error": str(e)}), 400
+    # {"async": true}: run in the background, poll GET /optimize/<job_id>
+    if bool(data.get("async", False)):
+        logger = current_app.logger
+        try:
+            validate_tickers(args["tickers"])  # bad input is a 400 now, not a failed job
+            job_id = submit_job(
+                lambda: _run_optimize(args),
+                lambda e: _optimize_error(e, logger)[0],
+            )
+        except Exception as e:  # InputError, or e.g. job dir not private
+            payload, status = _optimize_error(e, logger)
+            return _json(payload, status)
+        return _json({"ok": True, "job_id": job_id, "status": "queued"}, 202)
 
+    try:
+        return _json(_run_optimize(args), 200)
     except Exception as e:
-        current_app.logger.exception("optimize_portfolio failed")
-        return jsonify({"ok": False, "type": "server_error", "error": "Internal server error"}), 500
+        payload, status = _optimize_error(e, current_app.logger)
+        return _json(payload, status)
+
+@api_bp.route("/optimize/<job_id>", methods=["GET"])
+def optimize_job(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return _json({"ok": False, "type": "input_error", "error": "Unknown job id."}, 404)
+    return _json({**job, "ok": job["status"] != "error"}, 200)
 
 from backend.portfolio.marketdata import fetch_last_quote, MarketDataError
 
@@ -39,11 +84,12 @@ from backend.portfolio.marketdata import fetch_last_quote, MarketDataError
 def ticker_last():
     data = request.get_json(silent=True) or {}
     ticker = data.get("ticker", "")
+    want_country = bool(data.get("want_country", True))
     try:
-        payload = fetch_last_quote(ticker)
-        return jsonify({"ok": True, **payload}), 200
+        payload = fetch_last_quote(ticker, want_country=want_country)
+        return _json({"ok": True, **payload}, 200)
     except MarketDataError as e:
-        return jsonify({"ok": False, "type": "input_error", "error": str(e)}), 400
+        return _json({"ok": False, "type": "input_error", "error": str(e)}, 400)
     except Exception:
         current_app.logger.exception("ticker_last failed")
-        return jsonify({"ok": False, "type": "server_error", "error": "Internal server error"}), 500
+        return _json({"ok": False, "type": "server_error", "error": "Internal server error"}, 500)
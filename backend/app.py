@@ -2,6 +2,7 @@ import logging
 from flask import Flask, jsonify
 from flask_cors import CORS
 from .api import api_bp
+from .portfolio.optimizer import warmup
 
 def create_app():
     app = Flask(__name__)
@@ -15,6 +16,13 @@ def create_app():
     app.logger.addHandler(handler)
     app.logger.setLevel(logging.INFO)
 
+    # surface price-cache hit/miss counts alongside the app log; the logger
+    # is process-global, so attach only once however often create_app runs
+    cache_logger = logging.getLogger("portfolio.cache")
+    if not cache_logger.handlers:
+        cache_logger.addHandler(handler)
+        cache_logger.setLevel(logging.INFO)
+
     # Blueprints
     app.register_blueprint(api_bp)
 
@@ -26,4 +34,7 @@ def create_app():
 
 if __name__ == "__main__":
     app = create_app()
+    # JIT-compile the Monte Carlo kernel now, not on the first request
+    # (under gunicorn this happens per worker, in post_fork)
+    warmup()
     app.run(host="0.0.0.0", port=5001, debug=True)
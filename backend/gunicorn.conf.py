@@ -0,0 +1,33 @@
+"""
+gunicorn config — run from the repo root:
+    gunicorn -c backend/gunicorn.conf.py
+preload_app imports the app (numpy, pandas, matplotlib, yfinance, numba) once
+in the master; workers share it copy-on-write. The Numba kernel is warmed in
+post_fork: running a parallel kernel in the master before fork is unsafe
+(GNU OpenMP aborts the children).
+"""
+
+import os
+import multiprocessing
+
+_cpus = multiprocessing.cpu_count()
+
+wsgi_app = "backend.app:create_app()"
+bind = "0.0.0.0:5001"
+preload_app = True
+# one worker per _THREADS_PER_WORKER cores so each gets enough Numba threads
+# to pass the kernel gate (optimizer._MC_KERNEL_MIN_THREADS); request
+# concurrency comes from gthread threads, most of it is yfinance I/O
+_THREADS_PER_WORKER = 4
+workers = int(os.environ.get("WEB_CONCURRENCY", max(1, _cpus // _THREADS_PER_WORKER)))
+worker_class = "gthread"
+threads = 4
+timeout = 120    # optimize waits on yfinance downloads
+
+# split the cores between workers instead of every worker starting `cpu`
+# Numba threads; read by numba at import, i.e. when the app is preloaded
+os.environ.setdefault("NUMBA_NUM_THREADS", str(max(1, _cpus // workers)))
+
+def post_fork(server, worker):
+    from backend.portfolio.optimizer import warmup
+    warmup()
@@ -0,0 +1,113 @@
+"""
+portfolio/cache.py — small on-disk cache for yfinance price history
+Frames are stored as CSV under PORTDR_CACHE_DIR and expire after a TTL.
+CSV (not pickle) so a planted cache file can never execute code; the
+directory must also be private (owned by us, no group/other access).
+"""
+
+from typing import Callable, Dict, Optional
+import os
+import stat
+import time
+import hashlib
+import tempfile
+import logging
+import pandas as pd
+
+logger = logging.getLogger("portfolio.cache")
+
+HISTORY_TTL = 24 * 60 * 60   # daily/monthly bars: safe to reuse for a day
+QUOTE_TTL = 10 * 60          # recent candles for last-quote lookups
+
+_CACHE_DIR = os.environ.get(
+    "PORTDR_CACHE_DIR", os.path.join(tempfile.gettempdir(), "portdr-cache")
+)
+
+_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+_warned_dirs = set()
+
+def history_key(ticker: str, period: str, interval: str) -> str:
+    return f"{ticker}:{period}:{interval}"
+
+def _path_for(key: str) -> str:
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(_CACHE_DIR, f"{digest}.csv")
+
+def ensure_private_dir(path: str) -> bool:
+    """
+    Create `path` (0700) if needed; True if it is a real directory owned by
+    this user with no group/other permissions.
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+    except OSError:
+        return False
+    ok = stat.S_ISDIR(st.st_mode) and not (st.st_mode & 0o077)
+    if hasattr(os, "getuid"):
+        ok = ok and st.st_uid == os.getuid()
+    return ok
+
+def _cache_dir_ok() -> bool:
+    """
+    The cache is disabled unless its dir is private (ensure_private_dir):
+    anyone able to write there could feed us price data.
+    """
+    ok = ensure_private_dir(_CACHE_DIR)
+    if not ok and _CACHE_DIR not in _warned_dirs:
+        _warned_dirs.add(_CACHE_DIR)
+        logger.warning(f"cache disabled: {_CACHE_DIR} is not a private directory owned by this user")
+    return ok
+
+def _record(key: str, hit: bool) -> None:
+    _stats["hits" if hit else "misses"] += 1
+    logger.debug(f"cache {'hit' if hit else 'miss'} {key}")
+
+def log_fetch(hits: int, misses: int) -> None:
+    """One INFO line per fetch (not per key), with the process-wide totals."""
+    logger.info(f"cache hits={hits}, misses={misses} "
+                f"(total hits={_stats['hits']}, misses={_stats['misses']})")
+
+def get_frame(key: str, ttl: float) -> Optional[pd.DataFrame]:
+    """Cached DataFrame for `key`, or None if missing/expired/unreadable."""
+    path = _path_for(key)
+    df = None
+    if _cache_dir_ok():
+        try:
+            if time.time() - os.path.getmtime(path) <= ttl:
+                df = pd.read_csv(path, index_col=0, parse_dates=[0])
+        except Exception:
+            df = None
+    _record(key, df is not None)
+    return df
+
+def put_frame(key: str, df: pd.DataFrame) -> None:
+    """
+    Store `df` atomically; cache write failures are never fatal. Timestamps
+    are stored tz-naive (an aware index keeps its local wall time).
+    """
+    if not _cache_dir_ok():
+        return
+    path = _path_for(key)
+    try:
+        if isinstance(df.index, pd.DatetimeIndex) and df.index.tz is not None:
+            df = df.copy()
+            df.index = df.index.tz_localize(None)
+        fd, tmp = tempfile.mkstemp(dir=_CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        df.to_csv(tmp)
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"cache write failed for {key}: {e}")
+
+def cached_frame(key: str, ttl: float, fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Return the cached frame for `key`, calling `fetch` (and storing a non-empty result) on miss."""
+    df = get_frame(key, ttl)
+    log_fetch(int(df is not None), int(df is None))
+    if df is not None:
+        return df
+
+    df = fetch()
+    if df is not None and not df.empty:
+        put_frame(key, df)
+    return df
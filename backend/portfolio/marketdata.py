@@ -1,17 +1,24 @@
 from typing import Dict, Any
 import pandas as pd
 import yfinance as yf
+from backend.portfolio.cache import cached_frame, history_key, QUOTE_TTL
+from backend.portfolio.session import YF_SESSION
 
 class MarketDataError(ValueError):
     pass
 
-def fetch_last_quote(ticker: str) -> Dict[str, Any]:
+def fetch_last_quote(ticker: str, *, want_country: bool = True) -> Dict[str, Any]:
     if not isinstance(ticker, str) or not ticker.strip():
         raise MarketDataError("Provide a single ticker string.")
     t = ticker.strip().upper()
+    tk = yf.Ticker(t, session=YF_SESSION)
 
     # recent daily candles; auto-adjusted
-    hist = yf.Ticker(t).history(period="10d", interval="1d", auto_adjust=True, actions=False)
+    hist = cached_frame(
+        history_key(t, "10d", "1d"),
+        QUOTE_TTL,
+        lambda: tk.history(period="10d", interval="1d", auto_adjust=True, actions=False),
+    )
     hist = hist[["Open", "Close"]].dropna()
     if hist.empty:
         raise MarketDataError(f"No recent price data for {t}.")
@@ -20,12 +27,14 @@ def fetch_last_quote(ticker: str) -> Dict[str, Any]:
     last = hist.iloc[-1]
     last_date = hist.index[-1].strftime("%Y-%m-%d")
 
+    # get_info() is a separate, slow request; country is nice-to-have
     country = None
-    try:
-        info = yf.Ticker(t).get_info()
-        country = (info or {}).get("country")
-    except Exception:
-        pass
+    if want_country:
+        try:
+            info = tk.get_info()
+            country = (info or {}).get("country")
+        except Exception:
+            pass
 
     return {
         "ticker": t,
@@ -0,0 +1,9 @@
+"""
+portfolio/session.py — shared HTTP session for yfinance
+One module-global curl_cffi session (browser impersonation, pooled keep-alive
+connections) so every Ticker/download call reuses warm TLS connections.
+"""
+
+from curl_cffi import requests as cffi_requests
+
+YF_SESSION = cffi_requests.Session(impersonate="chrome")
@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.portfolio import cache
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setattr(cache, "_CACHE_DIR", str(path))
+    return path
+
+def _frame(index):
+    return pd.DataFrame({"Open": [1.0, 2.0, np.nan], "Close": [1.5, 2.5, 3.5]}, index=index)
+
+def test_round_trip(cache_dir):
+    df = _frame(pd.date_range("2020-01-01", periods=3, freq="MS", name="Date"))
+    cache.put_frame("AAPL:10y:1mo", df)
+    assert oct(os.stat(cache_dir).st_mode & 0o777) == oct(0o700)
+    pd.testing.assert_frame_equal(cache.get_frame("AAPL:10y:1mo", 60), df, check_freq=False)
+
+def test_aware_index_stored_as_wall_time(cache_dir):
+    index = pd.date_range("2020-03-01", periods=3, freq="D", tz="America/New_York")
+    cache.put_frame("AAPL:10d:1d", _frame(index))
+    got = cache.get_frame("AAPL:10d:1d", 60)
+    assert got.index.tz is None
+    assert list(got.index) == list(index.tz_localize(None))
+
+def test_expired_entry_is_a_miss(cache_dir):
+    cache.put_frame("K", _frame(pd.date_range("2020-01-01", periods=3)))
+    assert cache.get_frame("K", -1) is None
+
+def test_shared_directory_is_refused(cache_dir):
+    os.makedirs(cache_dir, mode=0o777)
+    os.chmod(cache_dir, 0o777)
+    cache.put_frame("K", _frame(pd.date_range("2020-01-01", periods=3)))
+    assert os.listdir(cache_dir) == []
+    assert cache.get_frame("K", 60) is None
+    fetched = _frame(pd.date_range("2021-01-01", periods=3))
+    assert cache.cached_frame("K", 60, lambda: fetched) is fetched
+    assert os.listdir(cache_dir) == []
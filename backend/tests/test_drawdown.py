@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.portfolio.optimizer import compute_drawdown_stats
+
+def _pandas_reference(portfolio_returns, risk_free_annual=0.02, periods_per_year=12):
+    """The original pandas implementation of compute_drawdown_stats."""
+    r = portfolio_returns.dropna()
+    wealth = (1 + r.fillna(0)).cumprod()
+    max_dd = float((wealth / wealth.cummax() - 1.0).min())
+    worst_month_date = r.idxmin()
+    if isinstance(r.index, pd.DatetimeIndex):
+        yearly = (1 + r).groupby(r.index.year).prod() - 1
+        worst_year_return, worst_year = float(yearly.min()), int(yearly.idxmin())
+        worst_month_date = worst_month_date.strftime("%Y-%m-%d")
+    else:
+        worst_year_return, worst_year = None, None
+        worst_month_date = str(worst_month_date)
+    years = len(r) / periods_per_year
+    annual_return = float((1 + r).cumprod().iloc[-1] ** (1 / years) - 1)
+    downside = r[r < 0]
+    dd_annual = float(downside.std(ddof=0)) * np.sqrt(periods_per_year) if len(downside) > 1 else 0.0
+    sortino = float((annual_return - risk_free_annual) / dd_annual) if dd_annual > 0 else None
+    return {
+        "max_drawdown": max_dd,
+        "worst_month_return": float(r.min()),
+        "worst_month_date": worst_month_date,
+        "worst_year_return": worst_year_return,
+        "worst_year": worst_year,
+        "downside_deviation_annual": float(dd_annual),
+        "sortino": sortino,
+        "annual_return_geom": annual_return,
+    }
+
+def _assert_matches(series):
+    got, want = compute_drawdown_stats(series), _pandas_reference(series)
+    assert got.keys() == want.keys()
+    for key, value in want.items():
+        if isinstance(value, float):
+            assert got[key] == pytest.approx(value, rel=1e-12, abs=1e-15), key
+        else:
+            assert got[key] == value, key
+
+def _monthly(n, seed=0, start="2015-01-31"):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=n, freq="ME")
+    return pd.Series(rng.normal(0.01, 0.05, n), index=index)
+
+@pytest.mark.parametrize("n", [2, 13, 120])
+def test_matches_pandas(n):
+    _assert_matches(_monthly(n, seed=n))
+
+def test_ragged_nans():
+    s = _monthly(60)
+    s.iloc[:7] = np.nan
+    s.iloc[[20, 33]] = np.nan
+    _assert_matches(s)
+
+def test_unsorted_index():
+    s = _monthly(48, seed=3)
+    _assert_matches(s.sample(frac=1.0, random_state=0))
+
+def test_single_element():
+    _assert_matches(_monthly(1))
+
+def test_non_datetime_index():
+    s = pd.Series([0.1, -0.2, 0.05, -0.01])
+    _assert_matches(s)
+    assert compute_drawdown_stats(s)["worst_year"] is None
+
+def test_empty():
+    out = compute_drawdown_stats(pd.Series([np.nan, np.nan], dtype=float))
+    assert out["max_drawdown"] is None and out["sortino"] is None
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.portfolio import cache, optimizer
+
+MONTHS = pd.date_range("2020-01-01", periods=6, freq="MS")
+
+def _ohlc(close, index):
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close}, index=index)
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_CACHE_DIR", str(tmp_path / "cache"))
+
+def test_partly_failed_batch_then_retry(monkeypatch):
+    # batch: AAPL comes back tz-naive, MSFT only as all-NaN columns
+    batch = pd.concat(
+        {"AAPL": _ohlc(np.arange(1, 7), MONTHS), "MSFT": _ohlc([np.nan] * 6, MONTHS)}, axis=1
+    )
+    monkeypatch.setattr(optimizer.yf, "download", lambda *a, **k: batch)
+
+    # retry via Ticker.history: exchange-tz index
+    aware = MONTHS.tz_localize("America/New_York")
+
+    class FakeTicker:
+        def __init__(self, ticker, session=None):
+            self.ticker = ticker
+
+        def history(self, **kwargs):
+            assert self.ticker == "MSFT"
+            return _ohlc(np.arange(10, 16), aware)
+
+    monkeypatch.setattr(optimizer.yf, "Ticker", FakeTicker)
+
+    prices = optimizer._fetch_yfinance_data(["AAPL", "MSFT"])
+    assert list(prices.columns) == ["AAPL", "MSFT"]
+    assert prices.index.tz is None
+    assert prices.shape == (6, 2)
+    assert prices["MSFT"].tolist() == list(range(10, 16))
+
+    # the retried frame was cached tz-naive: the warm path mixes cleanly too
+    monkeypatch.setattr(optimizer.yf, "download", lambda *a, **k: pytest.fail("expected cache hit"))
+    cached = optimizer._fetch_yfinance_data(["AAPL", "MSFT"])
+    pd.testing.assert_frame_equal(cached, prices, check_freq=False)
+
+def test_all_tickers_failing_raises(monkeypatch):
+    monkeypatch.setattr(optimizer.yf, "download", lambda *a, **k: pd.DataFrame())
+
+    class EmptyTicker:
+        def __init__(self, ticker, session=None):
+            pass
+
+        def history(self, **kwargs):
+            return pd.DataFrame()
+
+    monkeypatch.setattr(optimizer.yf, "Ticker", EmptyTicker)
+    with pytest.raises(RuntimeError, match="Failed tickers: ZZZ"):
+        optimizer._fetch_yfinance_data(["ZZZ"])
+
+def test_cache_logged_once_per_fetch(monkeypatch, caplog):
+    batch = pd.concat({t: _ohlc(np.arange(1, 7), MONTHS) for t in ("AAPL", "MSFT")}, axis=1)
+    monkeypatch.setattr(optimizer.yf, "download", lambda *a, **k: batch)
+    with caplog.at_level("INFO", logger="portfolio.cache"):
+        optimizer._fetch_yfinance_data(["AAPL", "MSFT"])
+        optimizer._fetch_yfinance_data(["AAPL", "MSFT"])
+    lines = [r.getMessage() for r in caplog.records if r.name == "portfolio.cache" and r.levelname == "INFO"]
+    assert len(lines) == 2
+    assert lines[0].startswith("cache hits=0, misses=2")
+    assert lines[1].startswith("cache hits=2, misses=0")
@@ -0,0 +1,49 @@
+import numpy as np
+
+from backend.portfolio.optimizer import _frontier_sample, _pareto_front
+
+def _brute_force_front(vol, ret):
+    """Portfolios with a strictly higher return than every lower-vol one (ties: first in vol order)."""
+    order = np.argsort(vol, kind="stable")
+    keep, best = [], -np.inf
+    for i in order:
+        if ret[i] > best:
+            keep.append(i)
+            best = ret[i]
+    return np.array(keep, dtype=int)
+
+def _results(n, seed=0):
+    rng = np.random.default_rng(seed)
+    vol = rng.uniform(0.05, 0.3, n)
+    ret = rng.normal(0.08, 0.03, n)
+    return {"volatility": vol, "returns": ret, "sharpe": (ret - 0.02) / vol}
+
+def test_pareto_front_matches_brute_force():
+    for seed in range(5):
+        r = _results(500, seed)
+        np.testing.assert_array_equal(
+            _pareto_front(r["volatility"], r["returns"]),
+            _brute_force_front(r["volatility"], r["returns"]),
+        )
+
+def test_pareto_front_single_point_and_ties():
+    np.testing.assert_array_equal(_pareto_front(np.array([0.1]), np.array([0.05])), [0])
+    # equal vols: only the first to reach a new best return is kept
+    vol = np.array([0.1, 0.1, 0.2, 0.2])
+    ret = np.array([0.05, 0.05, 0.04, 0.07])
+    np.testing.assert_array_equal(_pareto_front(vol, ret), [0, 3])
+
+def test_frontier_sample_caps_points_and_keeps_front():
+    r = _results(20000)
+    vol, ret, sharpe = _frontier_sample(r, max_points=2000)
+    assert len(vol) <= 2000
+    front = _pareto_front(r["volatility"], r["returns"])
+    assert set(zip(r["volatility"][front], r["returns"][front])) <= set(zip(vol, ret))
+    # (vol, ret, sharpe) triples stay aligned
+    np.testing.assert_allclose(sharpe, (ret - 0.02) / vol)
+
+def test_frontier_sample_small_input_untouched():
+    r = _results(10)
+    vol, ret, sharpe = _frontier_sample(r, max_points=2000)
+    np.testing.assert_array_equal(vol, r["volatility"])
+    np.testing.assert_array_equal(ret, r["returns"])
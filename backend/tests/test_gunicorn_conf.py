@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numba")
+
+ROOT = Path(__file__).resolve().parents[2]
+CONF = ROOT / "backend" / "gunicorn.conf.py"
+
+# load the config with a faked core count, then import the optimizer the way
+# preload_app does (numba reads NUMBA_NUM_THREADS at import)
+_PROBE = """
+import json, multiprocessing, runpy, sys
+multiprocessing.cpu_count = lambda: int(sys.argv[2])
+conf = runpy.run_path(sys.argv[1])
+from backend.portfolio import optimizer
+print(json.dumps({
+    "workers": conf["workers"],
+    "per_worker": conf["_THREADS_PER_WORKER"],
+    "min_threads": optimizer._MC_KERNEL_MIN_THREADS,
+    "numba_threads": optimizer.numba_config.NUMBA_NUM_THREADS,
+    "enabled": optimizer._KERNEL["enabled"],
+}))
+"""
+
+def _probe(cpus):
+    env = {k: v for k, v in os.environ.items() if k not in ("NUMBA_NUM_THREADS", "WEB_CONCURRENCY")}
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, str(CONF), str(cpus)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True, timeout=120,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+@pytest.mark.parametrize("cpus, workers, enabled", [(16, 4, True), (8, 2, True), (2, 1, False)])
+def test_workers_get_enough_numba_threads(cpus, workers, enabled):
+    conf = _probe(cpus)
+    assert conf["per_worker"] == conf["min_threads"]
+    assert conf["workers"] == workers
+    assert conf["numba_threads"] == max(1, cpus // workers)
+    assert conf["enabled"] is enabled
@@ -0,0 +1,69 @@
+import os
+import time
+
+import pytest
+
+from backend.api import jobs
+
+@pytest.fixture(autouse=True)
+def tmp_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "_JOB_DIR", str(tmp_path))
+    return tmp_path
+
+def _age(job_id, seconds):
+    t = time.time() - seconds
+    os.utime(jobs._path_for(job_id), (t, t))
+
+def _wait(job_id):
+    for _ in range(100):
+        job = jobs.get_job(job_id)
+        if job["status"] in ("done", "error"):
+            return job
+        time.sleep(0.01)
+    pytest.fail("job did not finish")
+
+def test_job_result_and_error():
+    assert _wait(jobs.submit_job(lambda: {"ok": True}, lambda e: {}))["result"] == {"ok": True}
+
+    def boom():
+        raise RuntimeError("x")
+
+    job = _wait(jobs.submit_job(boom, lambda e: {"ok": False, "error": str(e)}))
+    assert job["status"] == "error"
+    assert job["result"] == {"ok": False, "error": "x"}
+
+def test_stale_running_job_reported_as_error():
+    job_id = "0" * 32
+    jobs._write(job_id, {"job_id": job_id, "status": "running"})
+    assert jobs.get_job(job_id)["status"] == "running"
+    _age(job_id, jobs._JOB_STALE + 1)
+    assert jobs.get_job(job_id)["status"] == "error"
+
+def test_old_queued_job_stays_queued():
+    job_id = "3" * 32
+    jobs._write(job_id, {"job_id": job_id, "status": "queued"})
+    _age(job_id, jobs._JOB_STALE + 1)
+    assert jobs.get_job(job_id)["status"] == "queued"
+
+def test_expired_jobs_swept_on_submit():
+    old = "1" * 32
+    jobs._write(old, {"job_id": old, "status": "done", "result": {}})
+    _age(old, jobs._JOB_TTL + 1)
+    _wait(jobs.submit_job(lambda: {}, lambda e: {}))
+    assert jobs.get_job(old) is None
+
+def test_unknown_or_malformed_ids():
+    assert jobs.get_job("f" * 32) is None
+    assert jobs.get_job("../../etc/passwd") is None
+
+def test_refuses_shared_job_dir(tmp_jobs):
+    os.chmod(tmp_jobs, 0o777)
+    with pytest.raises(RuntimeError, match="not a private directory"):
+        jobs.submit_job(lambda: {}, lambda e: {})
+    assert os.listdir(tmp_jobs) == []
+
+    # a planted state file is not served either
+    job_id = "2" * 32
+    with open(jobs._path_for(job_id), "wb") as f:
+        f.write(b'{"job_id": "%s", "status": "done", "result": {}}' % job_id.encode())
+    assert jobs.get_job(job_id) is None
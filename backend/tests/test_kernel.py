@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+from backend.portfolio import optimizer
+
+# fixed annualized inputs, one clearly dominant asset on risk/return
+MEAN = np.array([0.08, 0.12, 0.05, 0.20], dtype=np.float32)
+COV = np.array(
+    [
+        [0.040, 0.006, 0.002, 0.010],
+        [0.006, 0.090, 0.004, 0.020],
+        [0.002, 0.004, 0.010, 0.001],
+        [0.010, 0.020, 0.001, 0.120],
+    ],
+    dtype=np.float32,
+)
+RF = 0.02
+SIMS = 20000
+
+@pytest.fixture(scope="module")
+def chol():
+    L = optimizer._cholesky_factor(COV)
+    assert L is not None
+    return L
+
+def test_kernel_matches_its_own_weights(chol):
+    ret, vol, sharpe, W = optimizer._mc_kernel(MEAN, chol, RF, SIMS)
+    assert W.shape == (SIMS, len(MEAN))
+    assert (W >= 0).all()
+    np.testing.assert_allclose(W.sum(axis=1), 1.0, rtol=1e-5)
+
+    W64 = W.astype(np.float64)
+    np.testing.assert_allclose(ret, W64 @ MEAN, rtol=1e-4)
+    expected_vol = np.sqrt(np.einsum("ij,jk,ik->i", W64, COV.astype(np.float64), W64))
+    np.testing.assert_allclose(vol, expected_vol, rtol=1e-4)
+    np.testing.assert_allclose(sharpe, (ret - RF) / vol, rtol=1e-4)
+
+def test_kernel_agrees_with_numpy_path(chol):
+    k_ret, k_vol, k_sharpe, k_W = optimizer._mc_kernel(MEAN, chol, RF, SIMS)
+    v_ret, v_vol, v_sharpe, v_W = optimizer._mc_vectorized(MEAN, COV, chol, RF, SIMS)
+
+    # same distribution: uniform weights on the simplex (mean 1/n each)
+    np.testing.assert_allclose(k_W.mean(axis=0), 1 / len(MEAN), atol=0.01)
+    np.testing.assert_allclose(v_W.mean(axis=0), 1 / len(MEAN), atol=0.01)
+    assert abs(k_vol.mean() - v_vol.mean()) < 0.01
+    assert abs(k_ret.mean() - v_ret.mean()) < 0.005
+
+    # and the same max-Sharpe portfolio, up to sampling noise
+    assert abs(k_sharpe.max() - v_sharpe.max()) < 0.01
+    np.testing.assert_allclose(k_W[k_sharpe.argmax()], v_W[v_sharpe.argmax()], atol=0.1)
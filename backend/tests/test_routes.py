@@ -0,0 +1,23 @@
+import logging
+
+import pytest
+
+from backend.api import jobs, routes
+from backend.app import create_app
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "_JOB_DIR", str(tmp_path))
+    return create_app().test_client()
+
+@pytest.mark.parametrize("tickers", [[], ["AAPL", "BAD$"], [1]])
+def test_async_rejects_bad_tickers_up_front(client, monkeypatch, tickers):
+    monkeypatch.setattr(routes, "submit_job", lambda *a: pytest.fail("job submitted"))
+    r = client.post("/api/optimize", json={"tickers": tickers, "async": True})
+    assert r.status_code == 400
+    assert r.get_json()["type"] == "input_error"
+
+def test_cache_log_handler_attached_once():
+    create_app()
+    create_app()
+    assert len(logging.getLogger("portfolio.cache").handlers) == 1
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from backend.portfolio.optimizer import _return_stats
+
+def _pandas_reference(returns):
+    """The original step-2 pandas formulas (cov as used by the simulator)."""
+    return (
+        returns.mean().to_numpy(),
+        returns.std(ddof=0).to_numpy(),
+        returns.cov().to_numpy(),
+        returns.corr().to_numpy(),
+    )
+
+def _returns(n_rows, n_cols, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2015-01-31", periods=n_rows, freq="ME")
+    return pd.DataFrame(rng.normal(0.01, 0.05, (n_rows, n_cols)), index=index,
+                        columns=[f"T{i}" for i in range(n_cols)])
+
+def _assert_matches(returns):
+    for got, want in zip(_return_stats(returns), _pandas_reference(returns)):
+        np.testing.assert_allclose(got, np.atleast_1d(want), rtol=1e-12, atol=1e-15)
+
+def test_complete_data_matches_pandas():
+    _assert_matches(_returns(120, 6))
+
+def test_ragged_history_matches_pandas_corr():
+    # a recent listing whose volatility regime differs from the full sample
+    r = _returns(120, 3, seed=1)
+    r.iloc[:90, 2] = np.nan
+    r.iloc[90:, 0] *= 4
+    r.iloc[90:, 2] = r.iloc[90:, 0] * 0.9 + r.iloc[90:, 1] * 0.1
+    _assert_matches(r)
+    corr = _return_stats(r)[3]
+    assert corr[0, 2] > 0.9  # not distorted by full-sample stds
+
+def test_single_asset():
+    mean, std, cov, corr = _return_stats(_returns(24, 1))
+    assert cov.shape == corr.shape == (1, 1)
+    np.testing.assert_allclose(corr, [[1.0]])
+    _assert_matches(_returns(24, 1))
+
+def test_unsorted_rows():
+    r = _returns(60, 4, seed=2)
+    _assert_matches(r.sample(frac=1.0, random_state=0))
@@ -6,6 +6,18 @@ import { Badge } from "@/components/ui/badge";
 import { Tooltip, TooltipContent, TooltipTrigger } from "@/components/ui/tooltip";
 import { toast } from "@/components/ui/sonner";
 import { Loader2, Plus, RefreshCw, Sparkles, X } from "lucide-react";
+import {
+  CartesianGrid,
+  Cell,
+  Pie,
+  PieChart,
+  ResponsiveContainer,
+  Scatter,
+  ScatterChart,
+  Tooltip as ChartTooltip,
+  XAxis,
+  YAxis,
+} from "recharts";
 
 // ---------------- Types ----------------
 interface BasicStat {
@@ -22,11 +34,14 @@ type RiskReturnRow = {
   Sharpe: number;
 };
 
+// Sampled frontier points (parallel arrays)
+type FrontierData = { vol: number[]; ret: number[]; sharpe: number[] };
+
 type OptimizePayload = {
   ok: boolean;
   results?: {
     risk_return: Record<string, RiskReturnRow>;
-    correlation: Record<string, Record<string, number>>;
+    correlation: CorrPayload;
     optimal_portfolio: {
       expected_return: number;
       volatility: number;
@@ -45,8 +60,10 @@ type OptimizePayload = {
     };
   };
   plots?: {
-    pie_chart?: string; // base64 png
-    efficient_frontier?: string; // base64 png
+    pie_chart?: string; // base64 png (only with render_plots: true)
+    efficient_frontier?: string; // base64 png (only with render_plots: true)
+    efficient_frontier_data?: FrontierData; // raw points, charted client-side
+    weights?: Record<string, number>;
   };
   meta?: {
     tickers: string[];
@@ -108,6 +125,8 @@ async function postOptimize(args: { symbols: string[]; riskFree: number; simulat
       risk_free: args.riskFree,
       simulations: args.simulations,
       verbose: false,
+      // charts are drawn here from the raw data; skips server-side PNG rendering
+      render_plots: false,
     }),
   });
 
@@ -124,6 +143,20 @@ function clamp01(n: number) {
 
 // Correlation Matrix inputs
 type CorrMatrix = Record<string, Record<string, number>>;
+// API shape: row/column labels plus a dense matrix (NaN arrives as null)
+type CorrPayload = { labels: string[]; matrix: (number | null)[][] };
+
+function toCorrMatrix(corr: CorrPayload): CorrMatrix {
+  const out: CorrMatrix = {};
+  corr.labels.forEach((r, i) => {
+    out[r] = {};
+    corr.labels.forEach((c, j) => {
+      const v = corr.matrix?.[i]?.[j];
+      out[r][c] = v == null ? NaN : v;
+    });
+  });
+  return out;
+}
 
 function safeNum(x: any, fallback = 0) {
   const n = Number(x);
@@ -302,6 +335,94 @@ function CorrelationHeatmap({ corr, weights }: { corr: CorrMatrix; weights?: Rec
   );
 }
 
+// Low Sharpe -> blue, high Sharpe -> green
+function sharpeColor(t: number) {
+  return `hsl(${220 - 80 * clamp01(t)} 70% ${40 + 10 * clamp01(t)}%)`;
+}
+
+function FrontierChart({ data }: { data: FrontierData }) {
+  const points = useMemo(
+    () => data.vol.map((vol, i) => ({ vol, ret: data.ret[i], sharpe: data.sharpe[i] })),
+    [data]
+  );
+
+  const [lo, hi] = useMemo(() => {
+    let min = Infinity;
+    let max = -Infinity;
+    for (const p of points) {
+      if (p.sharpe < min) min = p.sharpe;
+      if (p.sharpe > max) max = p.sharpe;
+    }
+    return [min, max];
+  }, [points]);
+  const span = hi > lo ? hi - lo : 1;
+
+  if (!points.length) {
+    return <div className="text-sm text-muted-foreground">Plot not available for this run.</div>;
+  }
+
+  return (
+    <div className="h-80 w-full">
+      <ResponsiveContainer width="100%" height="100%">
+        <ScatterChart margin={{ top: 8, right: 16, bottom: 24, left: 8 }}>
+          <CartesianGrid strokeDasharray="3 3" opacity={0.3} />
+          <XAxis
+            type="number"
+            dataKey="vol"
+            name="Volatility"
+            domain={["auto", "auto"]}
+            tickFormatter={(v: number) => pct.format(v)}
+            label={{ value: "Volatility", position: "insideBottom", offset: -12 }}
+          />
+          <YAxis
+            type="number"
+            dataKey="ret"
+            name="Expected return"
+            domain={["auto", "auto"]}
+            tickFormatter={(v: number) => pct.format(v)}
+          />
+          <ChartTooltip cursor={{ strokeDasharray: "3 3" }} formatter={(v) => pct.format(Number(v))} />
+          <Scatter data={points} isAnimationActive={false}>
+            {points.map((p, i) => (
+              <Cell key={i} fill={sharpeColor((p.sharpe - lo) / span)} fillOpacity={0.6} />
+            ))}
+          </Scatter>
+        </ScatterChart>
+      </ResponsiveContainer>
+    </div>
+  );
+}
+
+function WeightsPie({ weights }: { weights: { symbol: string; weight: number }[] }) {
+  const data = weights.filter((w) => w.weight > 0);
+
+  return (
+    <div className="h-64 w-full">
+      <ResponsiveContainer width="100%" height="100%">
+        <PieChart>
+          <Pie
+            data={data}
+            dataKey="weight"
+            nameKey="symbol"
+            outerRadius="80%"
+            isAnimationActive={false}
+            label={(entry: any) => `${entry.name} ${pct.format(entry.percent ?? 0)}`}
+          >
+            {data.map((w, i) => (
+              <Cell
+                key={w.symbol}
+                fill={`hsl(var(--primary) / ${1 - (0.7 * i) / Math.max(1, data.length)})`}
+                stroke="hsl(var(--background))"
+              />
+            ))}
+          </Pie>
+          <ChartTooltip formatter={(v) => pct.format(Number(v))} />
+        </PieChart>
+      </ResponsiveContainer>
+    </div>
+  );
+}
+
 export default function Analyze() {
   const [input, setInput] = useState("");
   const [symbols, setSymbols] = useState<string[]>([]);
@@ -598,14 +719,18 @@ export default function Analyze() {
                     ))}
                   </div>
 
-                  {optimizeMutation.data.plots?.pie_chart && (
+                  {weights.length > 0 && (
                     <div className="pt-4">
                       <div className="text-sm font-medium mb-2">Weight breakdown (chart)</div>
-                      <img
-                        className="w-full rounded-lg border border-border/50"
-                        alt="Optimal portfolio weights pie chart"
-                        src={`data:image/png;base64,${optimizeMutation.data.plots.pie_chart}`}
-                      />
+                      {optimizeMutation.data.plots?.pie_chart ? (
+                        <img
+                          className="w-full rounded-lg border border-border/50"
+                          alt="Optimal portfolio weights pie chart"
+                          src={`data:image/png;base64,${optimizeMutation.data.plots.pie_chart}`}
+                        />
+                      ) : (
+                        <WeightsPie weights={weights} />
+                      )}
                     </div>
                   )}
                 </CardContent>
@@ -623,6 +748,8 @@ export default function Analyze() {
                       alt="Efficient frontier plot"
                       src={`data:image/png;base64,${optimizeMutation.data.plots.efficient_frontier}`}
                     />
+                  ) : optimizeMutation.data.plots?.efficient_frontier_data ? (
+                    <FrontierChart data={optimizeMutation.data.plots.efficient_frontier_data} />
                   ) : (
                     <div className="text-sm text-muted-foreground">Plot not available for this run.</div>
                   )}
@@ -637,7 +764,7 @@ export default function Analyze() {
                   <CardDescription>Lower correlation across holdings typically indicates better diversification.</CardDescription>
                 </CardHeader>
                 <CardContent>
-                  <CorrelationHeatmap corr={optimizeMutation.data.results.correlation} weights={optimal.weights} />
+                  <CorrelationHeatmap corr={toCorrMatrix(optimizeMutation.data.results.correlation)} weights={optimal.weights} />
                 </CardContent>
               </Card>
             )}